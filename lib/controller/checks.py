@@ -1610,4 +1610,5 @@ def checkInternet():
     return CHECK_INTERNET_VALUE in (content or "")
 
 def setVerbosity():  # Cross-referenced function
-    raise NotImplementedError
+    from lib.core.option import setVerbosity as _setVerbosity
+    return _setVerbosity()
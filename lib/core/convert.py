@@ -380,7 +380,7 @@ def getUnicode(value, encoding=None, noneToNull=False):
         try:
             return six.text_type(value, encoding or (kb.get("pageEncoding") if kb.get("originalPage") else None) or UNICODE_ENCODING)
         except UnicodeDecodeError:
-            return six.text_type(value, UNICODE_ENCODING, errors="reversible")
+            return reversibleDecode(value)
     elif isListLike(value):
         value = list(getUnicode(_, encoding, noneToNull) for _ in value)
         return value
@@ -390,6 +390,25 @@ def getUnicode(value, encoding=None, noneToNull=False):
         except UnicodeDecodeError:
             return six.text_type(str(value), errors="ignore")  # encoding ignored for non-basestring instances
 
+def reversibleDecode(value, encoding=None):
+    """
+    Returns the unicode representation of the supplied byte value, storing undecodable bytes reversibly
+    (Note: the strict decode attempt keeps all-valid buffers on the fast C-level path, paying the
+    "reversible" error handler machinery only when invalid bytes are actually present)
+
+    >>> reversibleDecode(b"foobar")
+    'foobar'
+    >>> reversibleDecode(b"foo\\xffbar") == u"foo\\\\xffbar"
+    True
+    """
+
+    encoding = encoding or UNICODE_ENCODING
+
+    try:
+        return six.text_type(value, encoding)
+    except UnicodeDecodeError:
+        return six.text_type(value, encoding, errors="reversible")
+
 def getText(value, encoding=None):
     """
     Returns textual value of a given value (Note: not necessary Unicode on Python2)
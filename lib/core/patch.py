@@ -6,53 +6,60 @@ See the file 'LICENSE' for copying permission
 """
 
 import codecs
-import collections
+import http.client as _http_client
 import inspect
 import logging
 import os
 import random
 import re
+import socket
 import sys
 
-import lib.controller.checks
 import lib.core.common
 import lib.core.convert
 import lib.core.option
 import lib.core.threads
-import lib.request.connect
-import lib.utils.search
-import lib.utils.sqlalchemy
 import thirdparty.ansistrm.ansistrm
 import thirdparty.chardet.universaldetector
 
 from lib.core.common import filterNone
-from lib.core.common import getSafeExString
 from lib.core.common import isDigit
 from lib.core.common import isListLike
 from lib.core.common import readInput
 from lib.core.common import shellExec
 from lib.core.common import singleTimeWarnMessage
-from lib.core.compat import xrange
 from lib.core.convert import stdoutEncode
 from lib.core.data import conf
 from lib.core.enums import PLACE
-from lib.core.option import _setHTTPHandlers
-from lib.core.option import setVerbosity
 from lib.core.settings import INVALID_UNICODE_PRIVATE_AREA
 from lib.core.settings import INVALID_UNICODE_CHAR_FORMAT
 from lib.core.settings import IS_WIN
 from lib.request.templates import getPageTemplate
-from thirdparty import six
-from thirdparty.six import unichr as _unichr
-from thirdparty.six.moves import http_client as _http_client
 
-_rand = 0
+# feature checks resolved once at import time (keeping dirtyPatches() itself straight-line)
+_NEEDS_GETARGSPEC = not hasattr(inspect, "getargspec") and hasattr(inspect, "getfullargspec")
+_NEEDS_LOGGING_LOCK = not hasattr(logging, "_acquireLock")
+
+# lookup table (one entry per byte value) for the "reversible" unicode error handler, chosen once at import as INVALID_UNICODE_PRIVATE_AREA
+# is constant for the process lifetime (Note: 0x0f0000 marks the private area used for reversible storing of invalid byte values)
+_REVERSIBLE_TABLE = tuple(chr(0x0f0000 | _) for _ in range(256)) if INVALID_UNICODE_PRIVATE_AREA else tuple(INVALID_UNICODE_CHAR_FORMAT % _ for _ in range(256))
+
+# one-shot guards preventing repeated monkey-patching (e.g. duplicate codecs.register() calls slowing down every future codecs.lookup())
+_PATCHED = False
+_RESOLVED = False
+_UNISONED = False
 
 def dirtyPatches():
     """
     Place for "dirty" Python related patches
     """
 
+    global _PATCHED
+
+    if _PATCHED:
+        return
+    _PATCHED = True
+
     # accept overly long result lines (e.g. SQLi results in HTTP header responses)
     '''
     问题：在某些情况下，如 SQL 注入结果在 HTTP 响应头中，结果行可能会非常长，超过默认的最大行长度限制。
@@ -65,23 +72,21 @@ def dirtyPatches():
     问题：在 Python 3 中，如果缺少 Content-length 头，HTTPConnection 会自动进行分块编码，这可能导致双重分块编码问题。
     解决方案：通过覆盖 _send_output 方法，确保在 conf.get("chunked") 为 True 时，禁用分块编码
     '''
-    if six.PY3:
-        if not hasattr(_http_client.HTTPConnection, "__send_output"):
-            _http_client.HTTPConnection.__send_output = _http_client.HTTPConnection._send_output
+    if not hasattr(_http_client.HTTPConnection, "__send_output"):
+        _http_client.HTTPConnection.__send_output = _http_client.HTTPConnection._send_output
 
-        def _send_output(self, *args, **kwargs):
-            if conf.get("chunked") and "encode_chunked" in kwargs:
-                kwargs["encode_chunked"] = False
-            self.__send_output(*args, **kwargs)
+    # Note: positional arguments (instead of *args/**kwargs) to avoid unnecessary frame/dict overhead on a per-request hot path
+    def _send_output(self, message_body=None, encode_chunked=False):
+        return self.__send_output(message_body, False if conf.get("chunked") else encode_chunked)
 
-        _http_client.HTTPConnection._send_output = _send_output
+    _http_client.HTTPConnection._send_output = _send_output
 
-    # add support for inet_pton() on Windows OS
+    # add support for inet_pton() on Windows OS (Note: available in stdlib socket since Python 3.4, making the third-party monkey patch unnecessary there)
     '''
     问题：Windows 系统上没有 inet_pton 函数。
     解决方案：从第三方库 wininetpton 中导入 win_inet_pton，以提供类似功能。
     '''
-    if IS_WIN:
+    if IS_WIN and not hasattr(socket, "inet_pton"):
         from thirdparty.wininetpton import win_inet_pton
 
     # Reference: https://github.com/nodejs/node/issues/12786#issuecomment-298652440
@@ -89,30 +94,42 @@ def dirtyPatches():
     问题：在 Windows 上，某些情况下会尝试使用 cp65001 编码，这会导致错误。
     解决方案：注册一个编码器，将 cp65001 映射到 utf-8，避免编码错误。
     '''
-    codecs.register(lambda name: codecs.lookup("utf-8") if name == "cp65001" else None)
-
-    # Reference: http://bugs.python.org/issue17849
-    '''
-    问题：LineAndFileWrapper 的 readline 方法缺少 size 参数，导致在某些情况下会抛出错误。
-    解决方案：通过覆盖 readline 方法，使其接受 size 参数并调用 _readline
-    '''
-    if hasattr(_http_client, "LineAndFileWrapper"):
-        def _(self, *args):
-            return self._readline()
-
-        _http_client.LineAndFileWrapper._readline = _http_client.LineAndFileWrapper.readline
-        _http_client.LineAndFileWrapper.readline = _
-
-    # to prevent too much "guessing" in case of binary data retrieval
-    '''
-    问题：在处理二进制数据时，chardet 的默认阈值可能导致错误的编码检测。
-    解决方案：将 chardet 的最小阈值提高到 0.90，减少误判。
-    '''
-    thirdparty.chardet.universaldetector.MINIMUM_THRESHOLD = 0.90
+    # Note: the registered search function is invoked on every unresolved codec lookup, hence the CodecInfo is precomputed (instead of re-entering codecs.lookup() each time)
+    _utf8 = codecs.lookup("utf-8")
+    codecs.register(lambda name, _utf8=_utf8: _utf8 if name == "cp65001" else None)
 
-    match = re.search(r" --method[= ](\w+)", " ".join(sys.argv))
-    if match and match.group(1).upper() != PLACE.POST:
-        PLACE.CUSTOM_POST = PLACE.CUSTOM_POST.replace("POST", "%s (body)" % match.group(1))
+    # delegate charset detection to a C-accelerated implementation when one is installed (pure-Python chardet runs on every retrieved page)
+    try:
+        import cchardet
+        thirdparty.chardet.detect = cchardet.detect
+    except ImportError:
+        try:
+            from charset_normalizer import from_bytes
+
+            def _detect(byte_str, _from_bytes=from_bytes):
+                best = _from_bytes(bytes(byte_str)).best()
+                return {"encoding": best.encoding if best else None, "confidence": 1.0 if best else 0.0}
+
+            thirdparty.chardet.detect = _detect
+        except ImportError:
+            # to prevent too much "guessing" in case of binary data retrieval
+            '''
+            问题：在处理二进制数据时，chardet 的默认阈值可能导致错误的编码检测。
+            解决方案：将 chardet 的最小阈值提高到 0.90，减少误判。
+            '''
+            thirdparty.chardet.universaldetector.MINIMUM_THRESHOLD = 0.90
+
+    method = None
+    for i, argument in enumerate(sys.argv):
+        if argument == "--method" and i + 1 < len(sys.argv):
+            method = sys.argv[i + 1]
+            break
+        elif argument.startswith("--method="):
+            method = argument.split('=', 1)[1]
+            break
+
+    if method and re.search(r"\A\w+\Z", method) and method.upper() != PLACE.POST:
+        PLACE.CUSTOM_POST = PLACE.CUSTOM_POST.replace("POST", "%s (body)" % method)
 
     # Reference: https://github.com/sqlmapproject/sqlmap/issues/4314
     '''
@@ -122,22 +139,11 @@ def dirtyPatches():
     try:
         os.urandom(1)
     except NotImplementedError:
-        if six.PY3:
-            os.urandom = lambda size: bytes(random.randint(0, 255) for _ in range(size))
-        else:
-            os.urandom = lambda size: "".join(chr(random.randint(0, 255)) for _ in xrange(size))
+        # Note: batched getrandbits() is an order of magnitude faster than drawing individual bytes with random.randint()
+        def _urandom(size):
+            return random.getrandbits(size * 8).to_bytes(size, "little") if size > 0 else b""
 
-    # Reference: https://github.com/sqlmapproject/sqlmap/issues/5727
-    # Reference: https://stackoverflow.com/a/14076841
-    '''
-    问题：某些情况下，MySQLdb 可能不可用。
-    解决方案：尝试导入 pymysql 并将其安装为 MySQLdb，以提供兼容性。
-    '''
-    try:
-        import pymysql
-        pymysql.install_as_MySQLdb()
-    except (ImportError, AttributeError):
-        pass
+        os.urandom = _urandom
 
     # Reference: https://github.com/bottlepy/bottle/blob/df67999584a0e51ec5b691146c7fa4f3c87f5aac/bottle.py
     # Reference: https://python.readthedocs.io/en/v2.7.2/library/inspect.html#inspect.getargspec
@@ -145,21 +151,20 @@ def dirtyPatches():
     问题：在某些 Python 版本中，inspect.getargspec 已被弃用，而 inspect.getfullargspec 取而代之。
     解决方案：通过 inspect.getfullargspec 提供一个兼容的 getargspec 实现。
     '''
-    if not hasattr(inspect, "getargspec") and hasattr(inspect, "getfullargspec"):
-        ArgSpec = collections.namedtuple("ArgSpec", ("args", "varargs", "keywords", "defaults"))
+    if _NEEDS_GETARGSPEC:
+        class ArgSpec(object):
+            __slots__ = ("args", "varargs", "keywords", "defaults")
 
-        def makelist(data):
-            if isinstance(data, (tuple, list, set, dict)):
-                return list(data)
-            elif data:
-                return [data]
-            else:
-                return []
+            def __init__(self, args, varargs, keywords, defaults):
+                self.args = args
+                self.varargs = varargs
+                self.keywords = keywords
+                self.defaults = defaults
 
+        # Note: getfullargspec() guarantees 'args' and 'kwonlyargs' to be lists, hence no need for defensive type dispatch
         def getargspec(func):
             spec = inspect.getfullargspec(func)
-            kwargs = makelist(spec[0]) + makelist(spec.kwonlyargs)
-            return ArgSpec(kwargs, spec[1], spec[2], spec[3])
+            return ArgSpec(list(spec.args or ()) + list(spec.kwonlyargs or ()), spec.varargs, spec.varkw, spec.defaults)
 
         inspect.getargspec = getargspec
 
@@ -168,11 +173,19 @@ def dirtyPatches():
     问题：在处理 Unicode 数据时，可能会遇到不可解码的字符。
     解决方案：注册一个可逆的 Unicode 错误处理器，将不可解码的字符替换为特定格式。
     '''
-    def _reversible(ex):
-        if INVALID_UNICODE_PRIVATE_AREA:
-            return (u"".join(_unichr(int('000f00%2x' % (_ if isinstance(_, int) else ord(_)), 16)) for _ in ex.object[ex.start:ex.end]), ex.end)
-        else:
-            return (u"".join(INVALID_UNICODE_CHAR_FORMAT % (_ if isinstance(_, int) else ord(_)) for _ in ex.object[ex.start:ex.end]), ex.end)
+    def _reversible(ex, _table=_REVERSIBLE_TABLE):
+        # fast path for the predominant case of a single undecodable byte (e.g. binary garbage inside an otherwise ASCII page)
+        if ex.end - ex.start == 1:
+            value = ex.object[ex.start]
+            if not isinstance(value, int):
+                value = ord(value)
+            return (_table[value] if value < 0x100 else INVALID_UNICODE_CHAR_FORMAT % value, ex.end)
+
+        # Note: iterating bytes yields ints (never exceeding the table) while iterating str yields characters whose codepoints can (e.g. lone surrogates on the encode path) - dispatched once (per event) rather than per character
+        chunk = ex.object[ex.start:ex.end]
+        if isinstance(chunk, bytes):
+            return ("".join(_table[_] for _ in chunk), ex.end)
+        return ("".join(_table[_] if _ < 0x100 else INVALID_UNICODE_CHAR_FORMAT % _ for _ in map(ord, chunk)), ex.end)
 
     codecs.register_error("reversible", _reversible)
 
@@ -181,38 +194,27 @@ def dirtyPatches():
     问题：在 Python 3.13 中，logging 模块中的一些私有方法（如 _acquireLock 和 _releaseLock）已被移除。
     解决方案：重新实现这些方法，以确保兼容性。
     '''
-    if not hasattr(logging, "_acquireLock"):
-        def _acquireLock():
-            if logging._lock:
-                logging._lock.acquire()
-
-        logging._acquireLock = _acquireLock
-
-    if not hasattr(logging, "_releaseLock"):
-        def _releaseLock():
-            if logging._lock:
-                logging._lock.release()
-
-        logging._releaseLock = _releaseLock
+    # Note: 'logging._lock' is guaranteed to exist on Python 3.x, hence the bound methods can be assigned directly (without a wrapper function)
+    if _NEEDS_LOGGING_LOCK:
+        logging._acquireLock = logging._lock.acquire
+        logging._releaseLock = logging._lock.release
 
 def resolveCrossReferences():
     """
     Place for cross-reference resolution
     """
 
-    lib.core.threads.isDigit = isDigit
-    lib.core.threads.readInput = readInput
-    lib.core.common.getPageTemplate = getPageTemplate
-    lib.core.convert.filterNone = filterNone
-    lib.core.convert.isListLike = isListLike
-    lib.core.convert.shellExec = shellExec
-    lib.core.convert.singleTimeWarnMessage = singleTimeWarnMessage
-    lib.core.option._pympTempLeakPatch = pympTempLeakPatch
-    lib.request.connect.setHTTPHandlers = _setHTTPHandlers
-    lib.utils.search.setHTTPHandlers = _setHTTPHandlers
-    lib.controller.checks.setVerbosity = setVerbosity
-    lib.utils.sqlalchemy.getSafeExString = getSafeExString
-    thirdparty.ansistrm.ansistrm.stdoutEncode = stdoutEncode
+    global _RESOLVED
+
+    if _RESOLVED:
+        return
+    _RESOLVED = True
+
+    for module, name, value in _XREFS:
+        setattr(module, name, value)
+
+    # Note: lib.controller.checks, lib.request.connect, lib.utils.search and lib.utils.sqlalchemy resolve their
+    # cross-references lazily (at first call) so that they don't have to be imported here just to receive them
 
 def pympTempLeakPatch(tempDir):
     """
@@ -225,34 +227,55 @@ def pympTempLeakPatch(tempDir):
     except:
         pass
 
-def unisonRandom():
+# cross-references resolved by resolveCrossReferences() (Note: declared here as some of the referenced values are defined above)
+_XREFS = (
+    (lib.core.threads, "isDigit", isDigit),
+    (lib.core.threads, "readInput", readInput),
+    (lib.core.common, "getPageTemplate", getPageTemplate),
+    (lib.core.convert, "filterNone", filterNone),
+    (lib.core.convert, "isListLike", isListLike),
+    (lib.core.convert, "shellExec", shellExec),
+    (lib.core.convert, "singleTimeWarnMessage", singleTimeWarnMessage),
+    (lib.core.option, "_pympTempLeakPatch", pympTempLeakPatch),
+    (thirdparty.ansistrm.ansistrm, "stdoutEncode", stdoutEncode),
+)
+
+class _UnisonRandom(random.Random):
     """
-    Unifying random generated data across different Python versions
+    LCG-based generator producing identical random data across different Python versions
     """
 
-    def _lcg():
-        global _rand
-        a = 1140671485
-        c = 128201163
-        m = 2 ** 24
-        _rand = (a * _rand + c) % m
-        return _rand
+    __slots__ = ("state",)
 
-    def _randint(a, b):
-        _ = a + (_lcg() % (b - a + 1))
-        return _
+    def seed(self, a=0):
+        self.state = a or 0
+
+    def randint(self, a, b):
+        self.state = (1140671485 * self.state + 128201163) % 0x1000000
+        return a + (self.state % (b - a + 1))
+
+    def choice(self, seq):
+        return seq[self.randint(0, len(seq) - 1)]
+
+    def sample(self, population, k):
+        randint = self.randint
+        bound = len(population) - 1
+        return [population[randint(0, bound)] for _ in range(k)]
+
+def unisonRandom():
+    """
+    Unifying random generated data across different Python versions
+    """
 
-    def _choice(seq):
-        return seq[_randint(0, len(seq) - 1)]
+    global _UNISONED
 
-    def _sample(population, k):
-        return [_choice(population) for _ in xrange(k)]
+    if _UNISONED:
+        return
+    _UNISONED = True
 
-    def _seed(seed):
-        global _rand
-        _rand = seed
+    _random = _UnisonRandom()
 
-    random.choice = _choice
-    random.randint = _randint
-    random.sample = _sample
-    random.seed = _seed
+    random.choice = _random.choice
+    random.randint = _random.randint
+    random.sample = _random.sample
+    random.seed = _random.seed
@@ -1652,4 +1652,5 @@ class Connect(object):
             return comparison(page, headers, code, getRatioValue, pageLength)
 
 def setHTTPHandlers():  # Cross-referenced function
-    raise NotImplementedError
+    from lib.core.option import _setHTTPHandlers
+    return _setHTTPHandlers()
@@ -210,4 +210,5 @@ def search(dork):
         kb.choices.redirect = popValue()
 
 def setHTTPHandlers():  # Cross-referenced function
-    raise NotImplementedError
+    from lib.core.option import _setHTTPHandlers
+    return _setHTTPHandlers()
@@ -27,7 +27,14 @@ finally:
     sys.path = _path
 
 try:
-    import MySQLdb  # used by SQLAlchemy in case of MySQL
+    try:
+        import MySQLdb  # used by SQLAlchemy in case of MySQL
+    except ImportError:
+        # Reference: https://github.com/sqlmapproject/sqlmap/issues/5727
+        # Reference: https://stackoverflow.com/a/14076841
+        import pymysql
+        pymysql.install_as_MySQLdb()
+        import MySQLdb
     warnings.filterwarnings("error", category=MySQLdb.Warning)
 except (ImportError, AttributeError):
     pass
@@ -42,7 +49,8 @@ from thirdparty import six
 from thirdparty.six.moves import urllib as _urllib
 
 def getSafeExString(ex, encoding=None):  # Cross-referenced function
-    raise NotImplementedError
+    from lib.core.common import getSafeExString as _getSafeExString
+    return _getSafeExString(ex, encoding)
 
 class SQLAlchemy(GenericConnector):
     def __init__(self, dialect=None):